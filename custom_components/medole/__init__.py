@@ -3,10 +3,13 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import CONF_NAME, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import CONF_SLAVE_ID, DOMAIN
+from .coordinator import MedoleCoordinator
 from .modbus import MedoleModbusClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,12 +23,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Create the Modbus client once
     slave_id = config[CONF_SLAVE_ID]
-    modbus_client = MedoleModbusClient(hass, config, slave_id)
+    modbus_client = MedoleModbusClient.get_or_create(hass, config, slave_id)
+
+    # Open the connection once; it stays open for the life of the entry and
+    # is only reopened after a Modbus error
+    if not await modbus_client.async_connect():
+        await modbus_client.async_close()
+        raise ConfigEntryNotReady("Failed to connect to Modbus device")
+
+    # Poll the device once per cycle on behalf of every entity
+    coordinator = MedoleCoordinator(hass, modbus_client, config[CONF_NAME])
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await modbus_client.async_close()
+        raise
+
+    # Shared by every entity so they are grouped under the same device
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, f"{config[CONF_NAME]}_humidifier")},
+        name=config[CONF_NAME],
+        manufacturer="Medole",
+        model="IN-D17",
+    )
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "client": modbus_client,
         "config": config,
+        "coordinator": coordinator,
+        "device_info": device_info,
         "slave_id": slave_id,
     }
 
@@ -40,6 +67,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry, PLATFORMS
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["client"].async_close()
 
     return unload_ok
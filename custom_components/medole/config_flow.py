@@ -5,6 +5,7 @@ import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 
 from .const import (
     CONF_BAUDRATE,
@@ -30,6 +31,61 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Modbus slave IDs supported by the device, coerced from the form input
+SLAVE_ID_VALIDATOR = vol.All(
+    vol.Coerce(int, msg="invalid_slave_id"),
+    vol.Range(min=1, max=32, msg="invalid_slave_id"),
+)
+
+USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): str,
+        vol.Required(
+            CONF_CONNECTION_TYPE, default=CONNECTION_TYPE_SERIAL
+        ): vol.In(
+            [
+                CONNECTION_TYPE_SERIAL,
+                CONNECTION_TYPE_TCP,
+                CONNECTION_TYPE_RTUOVERTCP,
+            ]
+        ),
+    }
+)
+
+SERIAL_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PORT): str,
+        vol.Required(
+            CONF_SLAVE_ID, default=DEFAULT_SLAVE_ID
+        ): SLAVE_ID_VALIDATOR,
+        vol.Optional(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): vol.All(
+            vol.Coerce(int),
+            vol.In([9600, 19200, 38400, 57600, 115200]),
+        ),
+        vol.Optional(CONF_BYTESIZE, default=DEFAULT_BYTESIZE): vol.All(
+            vol.Coerce(int), vol.In([5, 6, 7, 8])
+        ),
+        vol.Optional(CONF_PARITY, default=DEFAULT_PARITY): vol.In(
+            ["N", "E", "O"]
+        ),
+        vol.Optional(CONF_STOPBITS, default=DEFAULT_STOPBITS): vol.All(
+            vol.Coerce(int), vol.In([1, 2])
+        ),
+    }
+)
+
+TCP_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): str,
+        vol.Required(CONF_TCP_PORT, default=DEFAULT_TCP_PORT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=65535)
+        ),
+        vol.Required(
+            CONF_SLAVE_ID, default=DEFAULT_SLAVE_ID
+        ): SLAVE_ID_VALIDATOR,
+    }
+)
+
 
 class MedoleDehumidifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Medole Dehumidifier."""
@@ -45,6 +101,10 @@ class MedoleDehumidifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._connection_type = user_input[CONF_CONNECTION_TYPE]
             self._name = user_input[CONF_NAME]
 
+            # Create unique ID from the name
+            await self.async_set_unique_id(self._name)
+            self._abort_if_unique_id_configured()
+
             # Proceed to the appropriate connection configuration step
             if self._connection_type == CONNECTION_TYPE_SERIAL:
                 return await self.async_step_serial()
@@ -55,173 +115,38 @@ class MedoleDehumidifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # Show connection type selection form
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_NAME): str,
-                    vol.Required(
-                        CONF_CONNECTION_TYPE, default=CONNECTION_TYPE_SERIAL
-                    ): vol.In(
-                        [
-                            CONNECTION_TYPE_SERIAL,
-                            CONNECTION_TYPE_TCP,
-                            CONNECTION_TYPE_RTUOVERTCP,
-                        ]
-                    ),
-                }
-            ),
+            data_schema=USER_SCHEMA,
             errors=errors,
         )
 
     async def async_step_serial(self, user_input=None):
         """Handle the serial connection step."""
-        errors = {}
-
-        if user_input is not None:
-            try:
-                # Convert slave_id from string to int and validate range
-                if CONF_SLAVE_ID in user_input:
-                    try:
-                        slave_id = int(user_input[CONF_SLAVE_ID])
-                        # Validate that slave ID is within the valid range (1-32)
-                        if slave_id < 1 or slave_id > 32:
-                            errors[CONF_SLAVE_ID] = "invalid_slave_id_range"
-                        else:
-                            user_input[CONF_SLAVE_ID] = slave_id
-                    except ValueError:
-                        errors[CONF_SLAVE_ID] = "invalid_slave_id"
-
-                # If there are errors, show the form again
-                if errors:
-                    return self.async_show_form(
-                        step_id="serial",
-                        data_schema=vol.Schema(
-                            {
-                                vol.Required(CONF_PORT): str,
-                                vol.Required(
-                                    CONF_SLAVE_ID,
-                                    default=str(DEFAULT_SLAVE_ID),
-                                ): str,
-                                vol.Optional(
-                                    CONF_BAUDRATE, default=DEFAULT_BAUDRATE
-                                ): vol.All(
-                                    vol.Coerce(int),
-                                    vol.In([9600, 19200, 38400, 57600, 115200]),
-                                ),
-                                vol.Optional(
-                                    CONF_BYTESIZE, default=DEFAULT_BYTESIZE
-                                ): vol.All(
-                                    vol.Coerce(int), vol.In([5, 6, 7, 8])
-                                ),
-                                vol.Optional(
-                                    CONF_PARITY, default=DEFAULT_PARITY
-                                ): vol.In(["N", "E", "O"]),
-                                vol.Optional(
-                                    CONF_STOPBITS, default=DEFAULT_STOPBITS
-                                ): vol.All(vol.Coerce(int), vol.In([1, 2])),
-                            }
-                        ),
-                        errors=errors,
-                    )
-
-                # Combine with the connection type and name
-                data = {
-                    CONF_NAME: self._name,
-                    CONF_CONNECTION_TYPE: CONNECTION_TYPE_SERIAL,
-                    **user_input,
-                }
-
-                # Create unique ID from the name
-                await self.async_set_unique_id(self._name)
-                self._abort_if_unique_id_configured()
-
-                return self.async_create_entry(
-                    title=self._name,
-                    data=data,
-                )
-            except Exception as ex:
-                _LOGGER.exception("Unexpected exception: %s", ex)
-                errors["base"] = "unknown"
-
-        # Show the serial configuration form
-        return self.async_show_form(
-            step_id="serial",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_PORT): str,
-                    vol.Required(
-                        CONF_SLAVE_ID, default=str(DEFAULT_SLAVE_ID)
-                    ): str,
-                    vol.Optional(
-                        CONF_BAUDRATE, default=DEFAULT_BAUDRATE
-                    ): vol.All(
-                        vol.Coerce(int),
-                        vol.In([9600, 19200, 38400, 57600, 115200]),
-                    ),
-                    vol.Optional(
-                        CONF_BYTESIZE, default=DEFAULT_BYTESIZE
-                    ): vol.All(vol.Coerce(int), vol.In([5, 6, 7, 8])),
-                    vol.Optional(CONF_PARITY, default=DEFAULT_PARITY): vol.In(
-                        ["N", "E", "O"]
-                    ),
-                    vol.Optional(
-                        CONF_STOPBITS, default=DEFAULT_STOPBITS
-                    ): vol.All(vol.Coerce(int), vol.In([1, 2])),
-                }
-            ),
-            errors=errors,
+        return self._async_handle_connection_step(
+            "serial", SERIAL_SCHEMA, CONNECTION_TYPE_SERIAL, user_input
         )
 
     async def async_step_tcp(self, user_input=None):
         """Handle the TCP connection step."""
+        return self._async_handle_connection_step(
+            "tcp", TCP_SCHEMA, self._connection_type, user_input
+        )
+
+    @callback
+    def _async_handle_connection_step(
+        self, step_id, data_schema, connection_type, user_input
+    ):
+        """Create the entry from a connection step or show its form."""
         errors = {}
 
         if user_input is not None:
             try:
-                # Convert slave_id from string to int and validate range
-                if CONF_SLAVE_ID in user_input:
-                    try:
-                        slave_id = int(user_input[CONF_SLAVE_ID])
-                        # Validate that slave ID is within the valid range (1-32)
-                        if slave_id < 1 or slave_id > 32:
-                            errors[CONF_SLAVE_ID] = "invalid_slave_id_range"
-                        else:
-                            user_input[CONF_SLAVE_ID] = slave_id
-                    except ValueError:
-                        errors[CONF_SLAVE_ID] = "invalid_slave_id"
-
-                # If there are errors, show the form again
-                if errors:
-                    return self.async_show_form(
-                        step_id="tcp",
-                        data_schema=vol.Schema(
-                            {
-                                vol.Required(CONF_HOST): str,
-                                vol.Required(
-                                    CONF_TCP_PORT, default=DEFAULT_TCP_PORT
-                                ): vol.All(
-                                    vol.Coerce(int),
-                                    vol.Range(min=1, max=65535),
-                                ),
-                                vol.Required(
-                                    CONF_SLAVE_ID,
-                                    default=str(DEFAULT_SLAVE_ID),
-                                ): str,
-                            }
-                        ),
-                        errors=errors,
-                    )
-
                 # Combine with the connection type and name
                 data = {
                     CONF_NAME: self._name,
-                    CONF_CONNECTION_TYPE: self._connection_type,
+                    CONF_CONNECTION_TYPE: connection_type,
                     **user_input,
                 }
 
-                # Create unique ID from the name
-                await self.async_set_unique_id(self._name)
-                self._abort_if_unique_id_configured()
-
                 return self.async_create_entry(
                     title=self._name,
                     data=data,
@@ -230,19 +155,9 @@ class MedoleDehumidifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception: %s", ex)
                 errors["base"] = "unknown"
 
-        # Show the TCP configuration form
+        # Show the connection configuration form
         return self.async_show_form(
-            step_id="tcp",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_HOST): str,
-                    vol.Required(
-                        CONF_TCP_PORT, default=DEFAULT_TCP_PORT
-                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
-                    vol.Required(
-                        CONF_SLAVE_ID, default=str(DEFAULT_SLAVE_ID)
-                    ): str,
-                }
-            ),
+            step_id=step_id,
+            data_schema=data_schema,
             errors=errors,
         )
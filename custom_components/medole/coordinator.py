@@ -0,0 +1,217 @@
+"""Data update coordinator for Medole Dehumidifier."""
+
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .const import (
+    DOMAIN,
+    REG_FAN_ALARM_HOURS,
+    REG_FAN_OPERATION_HOURS,
+    REG_FAN_SPEED,
+    REG_HUMIDITY_1,
+    REG_HUMIDITY_2,
+    REG_HUMIDITY_SETPOINT,
+    REG_OPERATION_STATUS,
+    REG_PIPE_TEMPERATURE,
+    REG_POWER,
+    REG_TEMPERATURE_1,
+    REG_TEMPERATURE_2,
+)
+from .modbus import MedoleModbusClient
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+# Longest interval between refreshes while the device keeps failing to answer
+MAX_BACKOFF_INTERVAL = timedelta(minutes=5)
+
+# Consecutive failed refreshes tolerated before entities become unavailable
+MAX_TOLERATED_FAILURES = 3
+
+# Seconds to wait for further refresh requests before refreshing once
+REQUEST_REFRESH_COOLDOWN = 0.3
+
+# Minimum time between reads of registers that rarely change on their own
+SLOW_UPDATE_INTERVAL = timedelta(minutes=10)
+
+# Registers polled by the coordinator, mapped to the minimum time between
+# reads; a zero interval reads the register on every refresh. Registers are
+# read in blocks, and a block is read as often as its fastest register.
+POLL_INTERVALS = {
+    REG_TEMPERATURE_1: timedelta(0),
+    REG_HUMIDITY_1: timedelta(0),
+    REG_TEMPERATURE_2: timedelta(0),
+    REG_HUMIDITY_2: timedelta(0),
+    REG_OPERATION_STATUS: timedelta(0),
+    REG_PIPE_TEMPERATURE: timedelta(0),
+    REG_FAN_OPERATION_HOURS: SLOW_UPDATE_INTERVAL,
+    REG_FAN_ALARM_HOURS: SLOW_UPDATE_INTERVAL,
+    # Fan speed and humidity setpoint share the control block with power,
+    # so they are read on every refresh along with it
+    REG_POWER: timedelta(0),
+    REG_FAN_SPEED: timedelta(0),
+    REG_HUMIDITY_SETPOINT: timedelta(0),
+}
+
+# Largest run of unpolled addresses a read block may span. Undocumented
+# addresses between the device's register groups may be rejected with an
+# illegal address exception, so only contiguous registers are merged.
+MAX_READ_GAP = 0
+
+
+def plan_read_blocks(
+    registers: Iterable[int], max_gap: int = MAX_READ_GAP
+) -> Tuple[Tuple[int, int], ...]:
+    """Group register addresses into as few (address, count) reads as possible.
+
+    A register separated from the previous block by at most max_gap unpolled
+    addresses is merged into that block.
+    """
+    blocks = []
+    for address in sorted(set(registers)):
+        if blocks:
+            start, count = blocks[-1]
+            if address - (start + count) <= max_gap:
+                blocks[-1] = (start, address - start + 1)
+                continue
+        blocks.append((address, 1))
+
+    return tuple(blocks)
+
+
+# (address, count) blocks read by the coordinator, each fetched with a single
+# Modbus request
+READ_BLOCKS = plan_read_blocks(POLL_INTERVALS)
+
+# Seconds between reads of each block, set by its most frequently polled
+# register
+READ_INTERVALS = tuple(
+    min(
+        POLL_INTERVALS[address]
+        for address in range(start, start + count)
+        if address in POLL_INTERVALS
+    ).total_seconds()
+    for start, count in READ_BLOCKS
+)
+
+# Register address of every value returned by each block, in read order
+BLOCK_ADDRESSES = tuple(
+    tuple(range(start, start + count)) for start, count in READ_BLOCKS
+)
+
+
+class MedoleCoordinator(DataUpdateCoordinator[Dict[int, int]]):
+    """Poll the registers of a Medole device in one batched update cycle.
+
+    All entities of the device share the resulting register map, so the bus
+    sees one batched read cycle per scan interval regardless of how many
+    entities are enabled. Blocks of rarely changing registers are only read
+    once their slower interval has passed, keeping their previous values in
+    between. Polls that return the same register values as the previous one
+    do not notify entities, so unchanged devices cause no state writes. Full
+    refreshes requested after a write always notify them, so entities drop
+    optimistic state the device did not apply.
+
+    Failed refreshes back off exponentially up to MAX_BACKOFF_INTERVAL, and
+    entities only become unavailable once several refreshes in a row failed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, client: MedoleModbusClient, name: str
+    ):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{name}",
+            update_interval=SCAN_INTERVAL,
+            # Only notify entities when a register value actually changed, or
+            # after a write (see async_request_full_refresh)
+            always_update=False,
+            # Coalesce refresh requests from back-to-back writes into one read
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REQUEST_REFRESH_COOLDOWN,
+                immediate=False,
+            ),
+        )
+        self.client = client
+        self._last_read = [None] * len(READ_BLOCKS)
+        self._consecutive_failures = 0
+        self._notify_pending = False
+
+    async def async_request_full_refresh(self) -> None:
+        """Request a refresh that reads every block and notifies entities."""
+        self._last_read = [None] * len(READ_BLOCKS)
+        self._notify_pending = True
+        await self.async_request_refresh()
+
+    async def async_refresh(self) -> None:
+        """Refresh data, notifying entities after a requested full refresh."""
+        await super().async_refresh()
+
+        # A write the device ignored reads back unchanged data, which must
+        # still reach entities holding optimistic state. Tolerated failures
+        # keep the previous data, so wait until the device was actually read.
+        if self._notify_pending and not self._consecutive_failures:
+            self._notify_pending = False
+            self.async_update_listeners()
+
+    async def _async_update_data(self) -> Dict[int, int]:
+        """Read the blocks that are due and map them by register address."""
+        now = time.monotonic()
+        due = [
+            index
+            for index, last_read in enumerate(self._last_read)
+            if last_read is None or now - last_read >= READ_INTERVALS[index]
+        ]
+
+        blocks = await self.client.async_read_blocks(
+            [READ_BLOCKS[index] for index in due]
+        )
+        if blocks is None:
+            return self._handle_read_failure()
+
+        if self._consecutive_failures:
+            self._consecutive_failures = 0
+            self.update_interval = SCAN_INTERVAL
+
+        for index in due:
+            self._last_read[index] = now
+
+        # Keep the previous values of blocks that were not due
+        data = dict(self.data) if self.data else {}
+        for index, registers in zip(due, blocks, strict=True):
+            data.update(zip(BLOCK_ADDRESSES[index], registers, strict=True))
+
+        return data
+
+    def _handle_read_failure(self) -> Dict[int, int]:
+        """Back off after a failed read, keeping data through short outages."""
+        self._consecutive_failures += 1
+        self.update_interval = min(
+            MAX_BACKOFF_INTERVAL,
+            SCAN_INTERVAL * 2**self._consecutive_failures,
+        )
+
+        if self.data and self._consecutive_failures < MAX_TOLERATED_FAILURES:
+            _LOGGER.debug(
+                "Failed to read registers from Medole device "
+                "(%s consecutive failures), retrying in %s",
+                self._consecutive_failures,
+                self.update_interval,
+            )
+            return self.data
+
+        raise UpdateFailed("Failed to read registers from Medole device")
@@ -10,8 +10,9 @@ from homeassistant.components.humidifier import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     CONTINUOUS_DEHUMIDIFICATION,
@@ -31,19 +32,34 @@ from .const import (
     STATUS_COMPRESSOR_ON,
     STATUS_FAN_ON,
 )
-
-# No need to import modbus functions as we'll use the client methods directly
+from .coordinator import MedoleCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-# Fan speed mapping for modes
-MODES = {
-    FAN_SPEED_LOW: "Low",
-    FAN_SPEED_MEDIUM: "Medium",
-    FAN_SPEED_HIGH: "High",
+PARALLEL_UPDATES = 0
+
+# Mode names indexed by fan speed register value (1-3)
+MODES = (None, "Low", "Medium", "High")
+
+REVERSE_MODES = {
+    "Low": FAN_SPEED_LOW,
+    "Medium": FAN_SPEED_MEDIUM,
+    "High": FAN_SPEED_HIGH,
 }
 
-REVERSE_MODES = {v: k for k, v in MODES.items()}
+AVAILABLE_MODES = MODES[FAN_SPEED_LOW:]
+
+# Humidifier action indexed by (power << 2) | (compressor_on << 1) | fan_on
+ACTIONS = (
+    HumidifierAction.OFF,
+    HumidifierAction.OFF,
+    HumidifierAction.OFF,
+    HumidifierAction.OFF,
+    HumidifierAction.IDLE,
+    HumidifierAction.IDLE,
+    HumidifierAction.DRYING,
+    HumidifierAction.DRYING,
+)
 
 
 async def async_setup_entry(
@@ -54,38 +70,36 @@ async def async_setup_entry(
     """Set up the Medole Dehumidifier humidifier platform."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     config = data["config"]
-    client = data["client"]
+    coordinator = data["coordinator"]
 
     name = config[CONF_NAME]
 
+    device_info = data["device_info"]
+
     async_add_entities(
-        [MedoleDehumidifierHumidifier(hass, name, client)],
-        True,
+        [MedoleDehumidifierHumidifier(coordinator, name, device_info)]
     )
 
 
-class MedoleDehumidifierHumidifier(HumidifierEntity):
+class MedoleDehumidifierHumidifier(
+    CoordinatorEntity[MedoleCoordinator], HumidifierEntity
+):
     """Representation of a Medole Dehumidifier humidifier device."""
 
     _attr_has_entity_name = True
     _attr_name = None
     _attr_supported_features = HumidifierEntityFeature.MODES
     _attr_device_class = HumidifierDeviceClass.DEHUMIDIFIER
-    _attr_available_modes = list(REVERSE_MODES.keys())
+    _attr_available_modes = AVAILABLE_MODES
     _attr_min_humidity = MIN_HUMIDITY
     _attr_max_humidity = MAX_HUMIDITY
 
-    def __init__(self, hass, name, client):
+    def __init__(self, coordinator, name, device_info):
         """Initialize the humidifier device."""
-        self.hass = hass
-        self._client = client
+        super().__init__(coordinator)
+        self._client = coordinator.client
         self._attr_unique_id = f"{name}_humidifier"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, self._attr_unique_id)},
-            "name": name,
-            "manufacturer": "Medole",
-            "model": "IN-D17",
-        }
+        self._attr_device_info = device_info
 
         # Initialize state variables
         self._attr_current_humidity = None
@@ -93,6 +107,7 @@ class MedoleDehumidifierHumidifier(HumidifierEntity):
         self._attr_mode = None
         self._attr_is_on = False
         self._attr_action = None
+        self._update_from_data()
 
     @property
     def current_humidity(self):
@@ -114,70 +129,42 @@ class MedoleDehumidifierHumidifier(HumidifierEntity):
         """Return maximum humidity settable with the ring."""
         return self._attr_max_humidity
 
-    async def async_update(self) -> None:
-        """Update the state of the humidifier device."""
-        # Get power status
-        power_result = await self._client.async_read_register(REG_POWER)
-        if power_result:
-            power_status = power_result.registers[0]
-            self._attr_is_on = power_status == 1
-        else:
-            _LOGGER.error("Failed to read power status")
+    def _update_from_data(self) -> None:
+        """Update the state from the coordinator's register map."""
+        data = self.coordinator.data
+        if not data:
             return
 
-        # Get the operation status register
-        status_result = await self._client.async_read_register(
-            REG_OPERATION_STATUS
-        )
+        self._attr_is_on = data[REG_POWER] == 1
 
-        if status_result:
-            status = status_result.registers[0]
-            compressor_on = status & STATUS_COMPRESSOR_ON
-            fan_on = status & STATUS_FAN_ON
-
-            # Determine action based on operation status
-            if not self._attr_is_on:
-                self._attr_action = HumidifierAction.OFF
-            elif compressor_on:
-                self._attr_action = HumidifierAction.DRYING
-            elif fan_on:
-                self._attr_action = HumidifierAction.IDLE
-            else:
-                self._attr_action = HumidifierAction.IDLE
+        humidity_setpoint = data[REG_HUMIDITY_SETPOINT]
+        if humidity_setpoint == CONTINUOUS_DEHUMIDIFICATION:
+            # For continuous mode, set to minimum
+            self._attr_target_humidity = MIN_HUMIDITY
         else:
-            _LOGGER.error("Failed to read operation status")
+            self._attr_target_humidity = humidity_setpoint
 
-        # Get the humidity setpoint
-        setpoint_result = await self._client.async_read_register(
-            REG_HUMIDITY_SETPOINT
+        fan_speed = data[REG_FAN_SPEED]
+        self._attr_mode = (
+            MODES[fan_speed]
+            if FAN_SPEED_LOW <= fan_speed <= FAN_SPEED_HIGH
+            else "Medium"
         )
-
-        if setpoint_result:
-            humidity_setpoint = setpoint_result.registers[0]
-            if humidity_setpoint == CONTINUOUS_DEHUMIDIFICATION:
-                # For continuous mode, set to minimum
-                self._attr_target_humidity = MIN_HUMIDITY
-            else:
-                self._attr_target_humidity = humidity_setpoint
-        else:
-            _LOGGER.error("Failed to read humidity setpoint")
-
-        # Get the fan speed
-        fan_speed_result = await self._client.async_read_register(REG_FAN_SPEED)
-
-        if fan_speed_result:
-            fan_speed = fan_speed_result.registers[0]
-            self._attr_mode = MODES.get(fan_speed, "Medium")
-        else:
-            _LOGGER.error("Failed to read fan speed")
-
-        # Get the current humidity
-        humidity_result = await self._client.async_read_register(REG_HUMIDITY_1)
-
-        if humidity_result:
-            self._attr_current_humidity = humidity_result.registers[0]
-        else:
-            _LOGGER.error("Failed to read current humidity")
+        self._attr_current_humidity = data[REG_HUMIDITY_1]
+
+        # Determine action based on power and operation status
+        status = data[REG_OPERATION_STATUS]
+        self._attr_action = ACTIONS[
+            self._attr_is_on << 2
+            | bool(status & STATUS_COMPRESSOR_ON) << 1
+            | bool(status & STATUS_FAN_ON)
+        ]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
 
     async def async_set_mode(self, mode: str) -> None:
         """Set new mode."""
@@ -189,6 +176,8 @@ class MedoleDehumidifierHumidifier(HumidifierEntity):
 
         if success:
             self._attr_mode = mode
+            self.async_write_ha_state()
+            await self.coordinator.async_request_full_refresh()
         else:
             _LOGGER.error("Failed to set mode to %s", mode)
 
@@ -203,26 +192,29 @@ class MedoleDehumidifierHumidifier(HumidifierEntity):
 
         if success:
             self._attr_target_humidity = humidity
+            self.async_write_ha_state()
+            await self.coordinator.async_request_full_refresh()
         else:
             _LOGGER.error("Failed to set humidity to %s", humidity)
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the device on."""
-        # Set the power on
-        result = await self._client.async_write_register(REG_POWER, 1)
-        if not result:
+        # Power on, enable dehumidify mode and disable purify mode in a single
+        # locked Modbus conversation, stopping at the first failed write
+        success = await self._client.async_write_blocks(
+            (
+                (REG_POWER, [1]),
+                (REG_DEHUMIDIFY_MODE, [1]),
+                (REG_PURIFY_MODE, [0]),
+            )
+        )
+        if success:
+            self._attr_is_on = True
+            self.async_write_ha_state()
+            await self.coordinator.async_request_full_refresh()
+        else:
             _LOGGER.error("Failed to turn on device")
 
-        # Set dehumidify mode on
-        result = await self._client.async_write_register(REG_DEHUMIDIFY_MODE, 1)
-        if not result:
-            _LOGGER.error("Failed to turn on dehumidify mode")
-
-        # Set purify mode off
-        result = await self._client.async_write_register(REG_PURIFY_MODE, 0)
-
-        self._attr_is_on = True
-
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the device off."""
         # Set power off
@@ -230,5 +222,7 @@ class MedoleDehumidifierHumidifier(HumidifierEntity):
 
         if success:
             self._attr_is_on = False
+            self.async_write_ha_state()
+            await self.coordinator.async_request_full_refresh()
         else:
             _LOGGER.error("Failed to turn power off")
@@ -1,15 +1,14 @@
 """Modbus client utilities for Medole Dehumidifier."""
 
-# ruff: noqa: I001
 import asyncio
+import inspect
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from homeassistant.core import HomeAssistant
-from pymodbus.client import ModbusSerialClient
-from pymodbus.client import ModbusTcpClient
-from pymodbus.client import ModbusTcpClient as ModbusRtuOverTcpClient
-from pymodbus.exceptions import ModbusException
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException, ModbusException
 
 from .const import (
     CONF_BAUDRATE,
@@ -31,55 +30,108 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Name of the keyword selecting the Modbus slave, which pymodbus has renamed
+# across releases (unit -> slave -> device_id)
+_REQUEST_PARAMETERS = inspect.signature(
+    AsyncModbusTcpClient.read_holding_registers
+).parameters
+SLAVE_KW = next(
+    (
+        name
+        for name in ("slave", "unit", "device_id")
+        if name in _REQUEST_PARAMETERS
+    ),
+    "slave",
+)
+
+# Seconds a block read is served from cache before the device is read again
+READ_CACHE_TTL = 2.0
+
+
+class ModbusTransport:
+    """A Modbus connection shared by every device on the same bus."""
+
+    def __init__(self, client):
+        """Initialize the shared transport."""
+        self.client = client
+        self.lock = asyncio.Lock()
+        self.needs_reconnect = False
+        self.users = 0
+
 
 class MedoleModbusClient:
     """Class to manage Modbus communication with Medole devices.
 
-    This class is implemented as a singleton to ensure only one instance exists.
+    Instances are obtained through get_or_create() so only one exists per
+    device, and each get_or_create() call must be paired with async_close().
+    Devices behind the same serial port or TCP gateway share a single
+    underlying connection and lock.
     """
 
     _instances = {}
+    _transports = {}
 
-    def __new__(
-        cls, hass: HomeAssistant, config: Dict[str, Any], slave_id: int
+    def __init__(
+        self, hass: HomeAssistant, config: Dict[str, Any], slave_id: int
     ):
-        """Create a singleton instance based on the config and slave_id."""
+        """Initialize the Modbus client."""
+        self.hass = hass
+        self.config = config
+        self.slave_id = slave_id
+        self._slave_kwargs = {SLAVE_KW: slave_id}
+        self._key = self._instance_key(config, slave_id)
+        self._transport = self._acquire_transport()
+        self.client = self._transport.client
+        self.lock = self._transport.lock
+        self._read_cache = {}
+        self._users = 0
+
+    @classmethod
+    def get_or_create(
+        cls, hass: HomeAssistant, config: Dict[str, Any], slave_id: int
+    ) -> "MedoleModbusClient":
+        """Return the client for a device, creating it on first use."""
+        key = cls._instance_key(config, slave_id)
+
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls._instances[key] = cls(hass, config, slave_id)
+
+        instance._users += 1
+        return instance
+
+    @classmethod
+    def _instance_key(cls, config: Dict[str, Any], slave_id: int) -> str:
+        """Return the key identifying a device on its bus."""
+        return f"{cls._transport_key(config)}_{slave_id}"
+
+    @staticmethod
+    def _transport_key(config: Dict[str, Any]) -> str:
+        """Return the key identifying the physical bus of a config."""
         connection_type = config.get(
             CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL
         )
 
         if connection_type == CONNECTION_TYPE_SERIAL:
-            key = f"serial_{config.get(CONF_PORT)}_{slave_id}"
-        elif connection_type == CONNECTION_TYPE_RTUOVERTCP:
-            key = (
-                f"rtuovertcp_{config.get(CONF_HOST)}_"
-                f"{config.get(CONF_TCP_PORT, DEFAULT_TCP_PORT)}_{slave_id}"
-            )
-        else:
-            key = (
-                f"tcp_{config.get(CONF_HOST)}_"
-                f"{config.get(CONF_TCP_PORT, DEFAULT_TCP_PORT)}_{slave_id}"
-            )
+            return f"serial_{config.get(CONF_PORT)}"
 
-        if key not in cls._instances:
-            cls._instances[key] = super(MedoleModbusClient, cls).__new__(cls)
-            cls._instances[key]._initialized = False
+        return (
+            f"{connection_type}_{config.get(CONF_HOST)}_"
+            f"{config.get(CONF_TCP_PORT, DEFAULT_TCP_PORT)}"
+        )
 
-        return cls._instances[key]
+    def _acquire_transport(self) -> ModbusTransport:
+        """Get the shared transport for this device's bus, creating it once."""
+        key = self._transport_key(self.config)
 
-    def __init__(
-        self, hass: HomeAssistant, config: Dict[str, Any], slave_id: int
-    ):
-        """Initialize the Modbus client."""
-        if hasattr(self, "_initialized") and self._initialized:
-            return
+        if key not in MedoleModbusClient._transports:
+            MedoleModbusClient._transports[key] = ModbusTransport(
+                self._create_modbus_client()
+            )
 
-        self.hass = hass
-        self.config = config
-        self.slave_id = slave_id
-        self.client = self._create_modbus_client()
-        self.lock = asyncio.Lock()
-        self._initialized = True
+        transport = MedoleModbusClient._transports[key]
+        transport.users += 1
+        return transport
 
     def _create_modbus_client(self):
         """Create a modbus client based on configuration."""
@@ -95,7 +147,7 @@ class MedoleModbusClient:
             parity = self.config.get(CONF_PARITY, DEFAULT_PARITY)
             stopbits = self.config.get(CONF_STOPBITS, DEFAULT_STOPBITS)
 
-            return ModbusSerialClient(
+            return AsyncModbusSerialClient(
                 port=port,
                 baudrate=baudrate,
                 bytesize=bytesize,
@@ -108,9 +160,9 @@ class MedoleModbusClient:
         host = self.config[CONF_HOST]
         port = self.config.get(CONF_TCP_PORT, DEFAULT_TCP_PORT)
 
-        # RTU over TCP
+        # RTU over TCP is the TCP client with RTU framing
         if connection_type == CONNECTION_TYPE_RTUOVERTCP:
-            return ModbusRtuOverTcpClient(
+            return AsyncModbusTcpClient(
                 host=host,
                 port=port,
                 timeout=1,
@@ -118,91 +170,161 @@ class MedoleModbusClient:
             )
 
         # Regular TCP
-        return ModbusTcpClient(
+        return AsyncModbusTcpClient(
             host=host,
             port=port,
             timeout=1,
         )
 
-    async def async_read_register(
-        self, address: int, count: int = 1
-    ) -> Optional[Any]:
-        """Read a register with proper connection handling and locking."""
-        try:
-            async with self.lock:
-                if not self.client.connect():
-                    _LOGGER.error("Failed to connect to Modbus device")
-                    return None
+    async def _async_ensure_connected(self) -> bool:
+        """Reuse the open connection, reconnecting only when needed."""
+        if self._transport.needs_reconnect:
+            self.client.close()
+            self._transport.needs_reconnect = False
 
-                result = await self.hass.async_add_executor_job(
-                    lambda: self.client.read_holding_registers(
-                        address, count=count, unit=self.slave_id
-                    )
-                )
+        if self.client.connected:
+            return True
 
-                if result.isError():
-                    _LOGGER.error(f"Error reading register {address}: {result}")
-                    return None
+        return await self.client.connect()
 
-                return result
-        except ModbusException as ex:
-            _LOGGER.error(f"Modbus exception reading register {address}: {ex}")
-            return None
-        finally:
+    def _flag_reconnect(self, ex: ModbusException) -> None:
+        """Reopen the connection before the next request if it was lost."""
+        # A timed out request leaves the connection usable, and reopening it
+        # would interrupt every other device sharing the bus
+        if isinstance(ex, ConnectionException) or not self.client.connected:
+            self._transport.needs_reconnect = True
+
+    async def async_connect(self) -> bool:
+        """Open the persistent connection to the device."""
+        async with self.lock:
+            return await self._async_ensure_connected()
+
+    async def async_close(self) -> None:
+        """Release the shared connection, closing it once no device uses it."""
+        self._users -= 1
+        if self._users > 0:
+            return
+
+        MedoleModbusClient._instances.pop(self._key, None)
+
+        self._transport.users -= 1
+        if self._transport.users > 0:
+            return
+
+        key = self._transport_key(self.config)
+        if MedoleModbusClient._transports.get(key) is self._transport:
+            del MedoleModbusClient._transports[key]
+        async with self.lock:
             self.client.close()
+            self._transport.needs_reconnect = False
 
     async def async_write_register(self, address: int, value: int) -> bool:
         """Write a register with proper connection handling and locking."""
         try:
             async with self.lock:
-                if not self.client.connect():
+                # Any cached read may now be stale
+                self._read_cache.clear()
+
+                if not await self._async_ensure_connected():
                     _LOGGER.error("Failed to connect to Modbus device")
                     return False
 
-                result = await self.hass.async_add_executor_job(
-                    lambda: self.client.write_register(
-                        address, value, unit=self.slave_id
-                    )
+                result = await self.client.write_register(
+                    address, value, **self._slave_kwargs
                 )
 
                 if result.isError():
-                    _LOGGER.error(f"Error writing register {address}: {result}")
+                    _LOGGER.error(
+                        "Error writing register %s: %s", address, result
+                    )
                     return False
 
                 return True
         except ModbusException as ex:
-            _LOGGER.error(f"Modbus exception writing register {address}: {ex}")
+            self._flag_reconnect(ex)
+            _LOGGER.error(
+                "Modbus exception writing register %s: %s", address, ex
+            )
             return False
-        finally:
-            self.client.close()
 
-    async def async_write_registers(
-        self, address: int, values: List[int]
+    async def _async_read_blocks(
+        self, blocks: Sequence[Tuple[int, int]]
+    ) -> Optional[List[List[int]]]:
+        """Read each (address, count) block, stopping at the first error."""
+        read = self.client.read_holding_registers
+        slave_kwargs = self._slave_kwargs
+        now = time.monotonic()
+        registers = []
+        for block in blocks:
+            # Serve blocks read within the last READ_CACHE_TTL seconds
+            cached = self._read_cache.get(block)
+            if cached is not None and now - cached[0] < READ_CACHE_TTL:
+                registers.append(cached[1])
+                continue
+
+            address, count = block
+            result = await read(address, count=count, **slave_kwargs)
+            if result.isError():
+                _LOGGER.error("Error reading register %s: %s", address, result)
+                return None
+            self._read_cache[block] = (now, result.registers)
+            registers.append(result.registers)
+
+        return registers
+
+    async def _async_write_blocks(
+        self, blocks: Sequence[Tuple[int, List[int]]]
     ) -> bool:
-        """Write multiple registers with proper connection handling and locking."""
+        """Write each (address, values) block, stopping at the first error."""
+        write_single = self.client.write_register
+        write_multiple = self.client.write_registers
+        slave_kwargs = self._slave_kwargs
+        for address, values in blocks:
+            if len(values) == 1:
+                result = await write_single(address, values[0], **slave_kwargs)
+            else:
+                result = await write_multiple(address, values, **slave_kwargs)
+            if result.isError():
+                _LOGGER.error("Error writing register %s: %s", address, result)
+                return False
+
+        return True
+
+    async def async_read_blocks(
+        self, blocks: Sequence[Tuple[int, int]]
+    ) -> Optional[List[List[int]]]:
+        """Read several register blocks in one locked Modbus conversation.
+
+        Returns the register values of each block in order, or None if any
+        read fails.
+        """
         try:
             async with self.lock:
-                if not self.client.connect():
+                if not await self._async_ensure_connected():
                     _LOGGER.error("Failed to connect to Modbus device")
-                    return False
+                    return None
 
-                result = await self.hass.async_add_executor_job(
-                    lambda: self.client.write_registers(
-                        address, values, unit=self.slave_id
-                    )
-                )
+                return await self._async_read_blocks(blocks)
+        except ModbusException as ex:
+            self._flag_reconnect(ex)
+            _LOGGER.error("Modbus exception reading registers: %s", ex)
+            return None
 
-                if result.isError():
-                    _LOGGER.error(
-                        f"Error writing to registers at {address}: {result}"
-                    )
+    async def async_write_blocks(
+        self, blocks: Sequence[Tuple[int, List[int]]]
+    ) -> bool:
+        """Write several register blocks in one locked Modbus conversation."""
+        try:
+            async with self.lock:
+                # Any cached read may now be stale
+                self._read_cache.clear()
+
+                if not await self._async_ensure_connected():
+                    _LOGGER.error("Failed to connect to Modbus device")
                     return False
 
-                return True
+                return await self._async_write_blocks(blocks)
         except ModbusException as ex:
-            _LOGGER.error(
-                f"Modbus exception writing to registers at {address}: {ex}"
-            )
+            self._flag_reconnect(ex)
+            _LOGGER.error("Modbus exception writing registers: %s", ex)
             return False
-        finally:
-            self.client.close()
@@ -1,10 +1,13 @@
 """Sensor platform for Medole Dehumidifier integration."""
 
 import logging
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -13,8 +16,9 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     CONF_NAME,
@@ -22,11 +26,9 @@ from .const import (
     REG_FAN_ALARM_HOURS,
     REG_FAN_OPERATION_HOURS,
     REG_HUMIDITY_1,
-    REG_HUMIDITY_2,
     REG_OPERATION_STATUS,
     REG_PIPE_TEMPERATURE,
     REG_TEMPERATURE_1,
-    REG_TEMPERATURE_2,
     STATUS_COMPRESSOR_ON,
     STATUS_FAN_ON,
     STATUS_HIGH_PRESSURE_ERROR,
@@ -36,9 +38,87 @@ from .const import (
     STATUS_ROOM_TEMP_ERROR,
     STATUS_WATER_FULL_ERROR,
 )
+from .coordinator import MedoleCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+PARALLEL_UPDATES = 0
+
+# Error bits of the operation status word, tested against the full 16 bits
+ERROR_BITS = (
+    (STATUS_PIPE_TEMP_ERROR, "pipe_temp_error"),
+    (STATUS_HUMIDITY_SENSOR_ERROR, "humidity_sensor_error"),
+    (STATUS_ROOM_TEMP_ERROR, "room_temp_error"),
+    (STATUS_WATER_FULL_ERROR, "water_full_error"),
+    (STATUS_HIGH_PRESSURE_ERROR, "high_pressure_error"),
+    (STATUS_LOW_PRESSURE_ERROR, "low_pressure_error"),
+)
+
+# Every status bit exposed as a state attribute of the status sensor
+STATUS_BITS = (
+    (STATUS_COMPRESSOR_ON, "compressor_on"),
+    (STATUS_FAN_ON, "fan_on"),
+) + ERROR_BITS
+
+
+def decode_temperature(value: int) -> float:
+    """Decode a temperature register (Hi Byte = decimal, Lo Byte = integer)."""
+    return (value & 0xFF) + ((value >> 8) & 0xFF) / 10
+
+
+@dataclass(frozen=True, kw_only=True)
+class MedoleSensorDescription(SensorEntityDescription):
+    """Describes a Medole sensor backed by a single register."""
+
+    register: int
+    decode: Callable[[int], Any] = lambda value: value
+
+
+SENSOR_DESCRIPTIONS = (
+    MedoleSensorDescription(
+        key="temperature_1",
+        name="Temperature",
+        register=REG_TEMPERATURE_1,
+        decode=decode_temperature,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    MedoleSensorDescription(
+        key="humidity_1",
+        name="Humidity",
+        register=REG_HUMIDITY_1,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    MedoleSensorDescription(
+        key="pipe_temperature",
+        name="Pipe Temperature",
+        register=REG_PIPE_TEMPERATURE,
+        decode=lambda value: value / 10.0,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    MedoleSensorDescription(
+        key="fan_operation_hours",
+        name="Fan Operation Hours",
+        register=REG_FAN_OPERATION_HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+    ),
+    MedoleSensorDescription(
+        key="fan_alarm_hours",
+        name="Fan Alarm Hours",
+        register=REG_FAN_ALARM_HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -48,229 +128,99 @@ async def async_setup_entry(
     """Set up the Medole Dehumidifier sensor platform."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     config = data["config"]
-    client = data["client"]
+    coordinator = data["coordinator"]
+    device_info = data["device_info"]
 
     name = config[CONF_NAME]
 
     entities = [
-        MedoleTemperatureSensor(hass, name, client, 1),
-        MedoleHumiditySensor(hass, name, client, 1),
-        MedolePipeTemperatureSensor(hass, name, client),
-        MedoleFanOperationHoursSensor(hass, name, client),
-        MedoleFanAlarmHoursSensor(hass, name, client),
-        MedoleStatusSensor(hass, name, client),
+        MedoleRegisterSensor(coordinator, name, device_info, description)
+        for description in SENSOR_DESCRIPTIONS
     ]
-    async_add_entities(entities, True)
+    entities.append(MedoleStatusSensor(coordinator, name, device_info))
+    async_add_entities(entities)
 
 
-class MedoleBaseSensor(SensorEntity):
+class MedoleBaseSensor(CoordinatorEntity[MedoleCoordinator], SensorEntity):
     """Base class for Medole Dehumidifier sensors."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, hass, name, client, sensor_type):
+    def __init__(self, coordinator, name, device_info, sensor_type):
         """Initialize the sensor."""
-        self.hass = hass
-        self._client = client
+        super().__init__(coordinator)
         self._attr_unique_id = f"{name}_{sensor_type}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{name}_humidifier")},
-            "name": name,
-            "manufacturer": "Medole",
-            "model": "IN-D17",
-        }
-
-
-class MedoleTemperatureSensor(MedoleBaseSensor):
-    """Representation of a Medole Temperature sensor."""
-
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-
-    def __init__(self, hass, name, client, sensor_number):
-        """Initialize the temperature sensor."""
-        super().__init__(hass, name, client, f"temperature_{sensor_number}")
-        self._sensor_number = sensor_number
-        self._attr_name = "Temperature"
-        self._register = (
-            REG_TEMPERATURE_1 if sensor_number == 1 else REG_TEMPERATURE_2
-        )
-
-    async def async_update(self) -> None:
-        """Update the state of the sensor."""
-        result = await self._client.async_read_register(self._register)
-
-        if result:
-            # Temperature format: Hi Byte = decimal, Lo Byte = integer
-            temp_value = result.registers[0]
-            integer_part = temp_value & 0xFF
-            decimal_part = (temp_value >> 8) & 0xFF
-            self._attr_native_value = integer_part + decimal_part / 10
-        else:
-            self._attr_native_value = None
-
-
-class MedoleHumiditySensor(MedoleBaseSensor):
-    """Representation of a Medole Humidity sensor."""
-
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = PERCENTAGE
-
-    def __init__(self, hass, name, client, sensor_number):
-        """Initialize the humidity sensor."""
-        super().__init__(hass, name, client, f"humidity_{sensor_number}")
-        self._sensor_number = sensor_number
-        self._attr_name = "Humidity"
-        self._register = (
-            REG_HUMIDITY_1 if sensor_number == 1 else REG_HUMIDITY_2
-        )
-
-    async def async_update(self) -> None:
-        """Update the state of the sensor."""
-        result = await self._client.async_read_register(self._register)
-
-        if result:
-            self._attr_native_value = result.registers[0]
-        else:
-            self._attr_native_value = None
-
-
-class MedolePipeTemperatureSensor(MedoleBaseSensor):
-    """Representation of a Medole Pipe Temperature sensor."""
-
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-
-    def __init__(self, hass, name, client):
-        """Initialize the pipe temperature sensor."""
-        super().__init__(hass, name, client, "pipe_temperature")
-        self._attr_name = "Pipe Temperature"
-
-    async def async_update(self) -> None:
-        """Update the state of the sensor."""
-        result = await self._client.async_read_register(REG_PIPE_TEMPERATURE)
-
-        if result:
-            self._attr_native_value = result.registers[0] / 10.0
-        else:
-            self._attr_native_value = None
-
-
-class MedoleFanOperationHoursSensor(MedoleBaseSensor):
-    """Representation of a Medole Fan Operation Hours sensor."""
+        self._attr_device_info = device_info
 
-    _attr_device_class = SensorDeviceClass.DURATION
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = UnitOfTime.HOURS
 
-    def __init__(self, hass, name, client):
-        """Initialize the fan operation hours sensor."""
-        super().__init__(hass, name, client, "fan_operation_hours")
-        self._attr_name = "Fan Operation Hours"
-
-    async def async_update(self) -> None:
-        """Update the state of the sensor."""
-        result = await self._client.async_read_register(REG_FAN_OPERATION_HOURS)
-
-        if result:
-            self._attr_native_value = result.registers[0]
-        else:
-            self._attr_native_value = None
+class MedoleRegisterSensor(MedoleBaseSensor):
+    """Representation of a Medole sensor read from a single register."""
 
+    entity_description: MedoleSensorDescription
 
-class MedoleFanAlarmHoursSensor(MedoleBaseSensor):
-    """Representation of a Medole Fan Alarm Hours sensor."""
-
-    _attr_device_class = SensorDeviceClass.DURATION
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTime.HOURS
-
-    def __init__(self, hass, name, client):
-        """Initialize the fan alarm hours sensor."""
-        super().__init__(hass, name, client, "fan_alarm_hours")
-        self._attr_name = "Fan Alarm Hours"
-
-    async def async_update(self) -> None:
-        """Update the state of the sensor."""
-        result = await self._client.async_read_register(REG_FAN_ALARM_HOURS)
+    def __init__(self, coordinator, name, device_info, description):
+        """Initialize the sensor."""
+        super().__init__(coordinator, name, device_info, description.key)
+        self.entity_description = description
 
-        if result:
-            self._attr_native_value = result.registers[0]
-        else:
-            self._attr_native_value = None
+    @property
+    def native_value(self):
+        """Return the decoded register value from the coordinator."""
+        description = self.entity_description
+        return description.decode(self.coordinator.data[description.register])
 
 
 class MedoleStatusSensor(MedoleBaseSensor):
     """Representation of a Medole Status sensor."""
 
-    def __init__(self, hass, name, client):
+    def __init__(self, coordinator, name, device_info):
         """Initialize the status sensor."""
-        super().__init__(hass, name, client, "status")
+        super().__init__(coordinator, name, device_info, "status")
         self._attr_name = "Status"
         self._status_value = None
+        self._status_attrs = {}
+        self._update_from_data()
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        if self._status_value is None:
-            return {}
-
-        lo_byte = self._status_value & 0xFF
-        hi_byte = (self._status_value >> 8) & 0xFF
-
-        return {
-            "compressor_on": bool(lo_byte & STATUS_COMPRESSOR_ON),
-            "fan_on": bool(lo_byte & STATUS_FAN_ON),
-            "pipe_temp_error": bool(lo_byte & STATUS_PIPE_TEMP_ERROR),
-            "humidity_sensor_error": bool(
-                lo_byte & STATUS_HUMIDITY_SENSOR_ERROR
-            ),
-            "room_temp_error": bool(lo_byte & STATUS_ROOM_TEMP_ERROR),
-            "water_full_error": bool(lo_byte & STATUS_WATER_FULL_ERROR),
-            "high_pressure_error": bool(
-                hi_byte & (STATUS_HIGH_PRESSURE_ERROR >> 8)
-            ),
-            "low_pressure_error": bool(
-                hi_byte & (STATUS_LOW_PRESSURE_ERROR >> 8)
-            ),
-        }
+        return self._status_attrs
 
-    async def async_update(self) -> None:
-        """Update the state of the sensor."""
-        result = await self._client.async_read_register(REG_OPERATION_STATUS)
-
-        if result:
-            self._status_value = result.registers[0]
-
-            # Set the state based on errors
-            errors = []
-            lo_byte = self._status_value & 0xFF
-            hi_byte = (self._status_value >> 8) & 0xFF
-
-            if lo_byte & STATUS_PIPE_TEMP_ERROR:
-                errors.append("pipe_temp_error")
-            if lo_byte & STATUS_HUMIDITY_SENSOR_ERROR:
-                errors.append("humidity_sensor_error")
-            if lo_byte & STATUS_ROOM_TEMP_ERROR:
-                errors.append("room_temp_error")
-            if lo_byte & STATUS_WATER_FULL_ERROR:
-                errors.append("water_full_error")
-            if hi_byte & (STATUS_HIGH_PRESSURE_ERROR >> 8):
-                errors.append("high_pressure_error")
-            if hi_byte & (STATUS_LOW_PRESSURE_ERROR >> 8):
-                errors.append("low_pressure_error")
-
-            if errors:
-                self._attr_native_value = "Error: " + ", ".join(errors)
-            elif lo_byte & STATUS_COMPRESSOR_ON:
-                self._attr_native_value = "Dehumidifying"
-            elif lo_byte & STATUS_FAN_ON:
-                self._attr_native_value = "Fan Only"
-            else:
-                self._attr_native_value = "Idle"
-        else:
+    @property
+    def available(self) -> bool:
+        """Stay available so communication errors are reported as the state."""
+        return True
+
+    def _update_from_data(self) -> None:
+        """Update the state from the coordinator's register map."""
+        if not (self.coordinator.last_update_success and self.coordinator.data):
             self._attr_native_value = "Communication Error"
             self._status_value = None
+            self._status_attrs = {}
+            return
+
+        status = self.coordinator.data[REG_OPERATION_STATUS]
+        if status == self._status_value:
+            return
+
+        # Decode the state and attributes once per change of the status word
+        self._status_value = status
+        self._status_attrs = {
+            name: bool(status & mask) for mask, name in STATUS_BITS
+        }
+
+        errors = [name for mask, name in ERROR_BITS if status & mask]
+        if errors:
+            self._attr_native_value = "Error: " + ", ".join(errors)
+        elif status & STATUS_COMPRESSOR_ON:
+            self._attr_native_value = "Dehumidifying"
+        elif status & STATUS_FAN_ON:
+            self._attr_native_value = "Fan Only"
+        else:
+            self._attr_native_value = "Idle"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
@@ -29,6 +29,9 @@ REG_CURRENT_SECONDS = 0x6402  # Current seconds
 REG_CURRENT_WEEKDAY = 0x6403  # Current weekday
 REG_TIMER_FUNCTION = 0x6404  # Timer function
 
+# Highest register address used by the device
+REG_MAX = REG_TIMER_FUNCTION
+
 # Status bits for REG_OPERATION_STATUS
 STATUS_COMPRESSOR_ON = 0x80  # bit7
 STATUS_FAN_ON = 0x40  # bit6
@@ -62,6 +65,15 @@ def decode_temperature(value):
     decimal_part = (value >> 8) & 0xFF
     return integer_part + decimal_part / 10.0
 
+def encode_temperature_tenths(tenths):
+    """Encode temperature in tenths of a degree for register."""
+    integer_part, decimal_part = divmod(max(0, tenths), 10)
+    return (decimal_part << 8) | integer_part
+
+def decode_temperature_tenths(value):
+    """Decode temperature register value to tenths of a degree."""
+    return (value & 0xFF) * 10 + ((value >> 8) & 0xFF)
+
 def encode_time(hour, minute):
     """Encode time value for register."""
     return (minute << 8) | hour
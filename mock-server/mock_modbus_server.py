@@ -3,11 +3,11 @@
 Mock Modbus TCP Server for Medole Dehumidifier.
 This script simulates a Medole Dehumidifier for testing purposes.
 """
+import asyncio
 import logging
 import random
 import time
-from datetime import datetime
-from threading import Thread
+from array import array
 
 # Import register definitions from common module
 from medole_registers import (
@@ -26,6 +26,7 @@ from medole_registers import (
     REG_HUMIDITY_1,
     REG_HUMIDITY_2,
     REG_HUMIDITY_SETPOINT,
+    REG_MAX,
     REG_OPERATION_STATUS,
     REG_PIPE_TEMPERATURE,
     REG_POWER,
@@ -37,6 +38,9 @@ from medole_registers import (
     # Status bits
     STATUS_COMPRESSOR_ON,
     STATUS_FAN_ON,
+    # Helper functions
+    decode_temperature_tenths,
+    encode_temperature_tenths,
 )
 from pymodbus.datastore import (
     ModbusSequentialDataBlock,
@@ -52,6 +56,44 @@ logging.basicConfig(
 )
 _LOGGER = logging.getLogger(__name__)
 
+# Registers whose writes change the simulated operation status
+CONTROL_REGISTERS = frozenset((REG_POWER, REG_HUMIDITY_SETPOINT, REG_DEHUMIDIFY_MODE))
+
+# Medole weekday (1=Sunday, ..., 7=Saturday) indexed by tm_wday
+# (0=Monday, ..., 6=Sunday)
+MEDOLE_WEEKDAYS = (2, 3, 4, 5, 6, 7, 1)
+
+# Seconds between sensor updates when no control register is written
+UPDATE_INTERVAL = 5
+
+
+class NotifyingDataBlock(ModbusSequentialDataBlock):
+    """Holding register block that signals client writes to control registers.
+
+    Values are stored as unsigned 16-bit integers in an array, like the
+    registers they model, and converted to lists only for pymodbus.
+    """
+
+    def __init__(self, address, values):
+        """Initialize the data block."""
+        super().__init__(address, values)
+        self.values = array("H", self.values)
+        self.control_written = asyncio.Event()
+
+    def getValues(self, address, count=1):
+        """Return count values starting at address as a list."""
+        start = address - self.address
+        return self.values[start:start + count].tolist()
+
+    def setValues(self, address, values):
+        """Set values and signal when a control register was written."""
+        if not isinstance(values, list):
+            values = [values]
+        start = address - self.address
+        self.values[start:start + len(values)] = array("H", values)
+        if not CONTROL_REGISTERS.isdisjoint(range(start, start + len(values))):
+            self.control_written.set()
+
 
 class MedoleDehumidifierMockServer:
     """Mock Modbus server for Medole Dehumidifier."""
@@ -61,11 +103,16 @@ class MedoleDehumidifierMockServer:
         self.host = host
         self.port = port
         self.server = None
-        self.server_thread = None
+        self.update_task = None
+        self.next_update = 0.0
+        self.fan_hundredths = 0
         self.running = False
+        # Random source for sensor noise, private so it can be seeded
+        self.rng = random.Random()
 
         # Initialize the data store with default values
         self.initialize_datastore()
+        self.set_initial_values()
 
     def initialize_datastore(self):
         """Initialize the Modbus data store with default values."""
@@ -73,77 +120,91 @@ class MedoleDehumidifierMockServer:
         # We'll use a single block for all registers to simplify
         # Adjust the address offset to match the register addresses
 
-        # Create a data block with zeros
-        block = ModbusSequentialDataBlock(0, [0] * 0x7000)
+        # Create a data block with zeros covering addresses 0 to REG_MAX. The
+        # slave context adds 1 to every address, so starting the block at 1
+        # makes values[addr] hold addr.
+        block = NotifyingDataBlock(1, [0] * (REG_MAX + 1))
         # Create the slave context
         self.context = ModbusSlaveContext(hr=block)
+        # Some pymodbus releases ignore hr unless di is also given
+        self.context.store["h"] = block
+        # Backing array of the holding registers, indexed by register address
+        self.registers = block.values
+        self.control_written = block.control_written
         # Create the server context with slave ID 1
         self.server_context = ModbusServerContext(slaves={1: self.context}, single=False)
 
     def set_initial_values(self):
+        registers = self.registers
+
         # Set initial values for registers
         # Temperature 1: 25.5°C (25 in low byte, 5 in high byte)
-        self.context.setValues(3, REG_TEMPERATURE_1, [0x0519])
+        registers[REG_TEMPERATURE_1] = encode_temperature_tenths(255)
         # Humidity 1: 60%
-        self.context.setValues(3, REG_HUMIDITY_1, [60])
+        registers[REG_HUMIDITY_1] = 60
         # Temperature 2: 26.0°C
-        self.context.setValues(3, REG_TEMPERATURE_2, [0x001A])
+        registers[REG_TEMPERATURE_2] = encode_temperature_tenths(260)
         # Humidity 2: 60%
-        self.context.setValues(3, REG_HUMIDITY_2, [60])
+        registers[REG_HUMIDITY_2] = 60
         # Operation status: Fan on
-        self.context.setValues(3, REG_OPERATION_STATUS, [STATUS_FAN_ON])
+        registers[REG_OPERATION_STATUS] = STATUS_FAN_ON
         # Pipe temperature: 15.0°C
-        self.context.setValues(3, REG_PIPE_TEMPERATURE, [0x000F])
-        # Fan operation hours: 100
-        self.context.setValues(3, REG_FAN_OPERATION_HOURS, [100])
+        registers[REG_PIPE_TEMPERATURE] = 0x000F
+        # Fan operation hours: 100, accumulated in hundredths of an hour
+        self.fan_hundredths = 100 * 100
+        registers[REG_FAN_OPERATION_HOURS] = self.fan_hundredths // 100
         # Fan alarm hours: 2400 (default)
-        self.context.setValues(3, REG_FAN_ALARM_HOURS, [2400])
+        registers[REG_FAN_ALARM_HOURS] = 2400
 
         # Control registers
         # Power: Off
-        self.context.setValues(3, REG_POWER, [0])
+        registers[REG_POWER] = 0
         # Fan speed: Low
-        self.context.setValues(3, REG_FAN_SPEED, [FAN_SPEED_LOW])
+        registers[REG_FAN_SPEED] = FAN_SPEED_LOW
         # Humidity setpoint: 50%
-        self.context.setValues(3, REG_HUMIDITY_SETPOINT, [50])
+        registers[REG_HUMIDITY_SETPOINT] = 50
         # Dehumidify mode: Off
-        self.context.setValues(3, REG_DEHUMIDIFY_MODE, [0])
+        registers[REG_DEHUMIDIFY_MODE] = 0
         # Purify mode: Off
-        self.context.setValues(3, REG_PURIFY_MODE, [0])
+        registers[REG_PURIFY_MODE] = 0
 
         # Time function registers
-        now = datetime.now()
+        now = time.localtime()
         # Current time: hour and minute
-        time_value = (now.minute << 8) | now.hour
-        self.context.setValues(3, REG_CURRENT_TIME, [time_value])
+        registers[REG_CURRENT_TIME] = (now.tm_min << 8) | now.tm_hour
         # Current seconds
-        self.context.setValues(3, REG_CURRENT_SECONDS, [now.second])
+        registers[REG_CURRENT_SECONDS] = now.tm_sec
         # Current weekday (1=Sunday, ..., 7=Saturday)
-        weekday = now.weekday() + 2  # Convert from 0-6 (Mon-Sun) to 2-7,1 (Mon-Sat,Sun)
-        if weekday == 8:
-            weekday = 1
-        self.context.setValues(3, REG_CURRENT_WEEKDAY, [weekday])
+        registers[REG_CURRENT_WEEKDAY] = MEDOLE_WEEKDAYS[now.tm_wday]
         # Timer function: Off
-        self.context.setValues(3, REG_TIMER_FUNCTION, [0])
+        registers[REG_TIMER_FUNCTION] = 0
 
-    def update_sensor_values(self):
+    async def update_sensor_values(self):
         """Update sensor values periodically to simulate real device behavior."""
-
-        self.set_initial_values()
+        registers = self.registers
+        uniform = self.rng.uniform
+        randint = self.rng.randint
+        control_changed = True
+        # Event loop time of the next scheduled update
+        self.next_update = asyncio.get_running_loop().time() + UPDATE_INTERVAL
 
         while self.running:
-            # Get current values
-            power = self.context.getValues(3, REG_POWER, 1)[0]
-            dehumidify_mode = self.context.getValues(3, REG_DEHUMIDIFY_MODE, 1)[0]
-            humidity_setpoint = self.context.getValues(3, REG_HUMIDITY_SETPOINT, 1)[0]
+            # Update current time
+            now = time.localtime()
+            time_value = (now.tm_min << 8) | now.tm_hour
+            # Current time and seconds (0x6401 - 0x6402)
+            registers[REG_CURRENT_TIME:REG_CURRENT_SECONDS + 1] = array("H", (time_value, now.tm_sec))
 
-            # Get current temperature and humidity
-            temp_reg = self.context.getValues(3, REG_TEMPERATURE_1, 1)[0]
-            temp_int = temp_reg & 0xFF
-            temp_dec = (temp_reg >> 8) & 0xFF
-            current_temp = temp_int + temp_dec / 10.0
+            # Get current control values (0x6201 - 0x6205)
+            power, _, humidity_setpoint, _, dehumidify_mode = registers[REG_POWER:REG_DEHUMIDIFY_MODE + 1]
 
-            current_humidity = self.context.getValues(3, REG_HUMIDITY_1, 1)[0]
+            # Only the clock changes while the device stays switched off
+            if power == 0 and not control_changed:
+                control_changed = await self.wait_for_next_update()
+                continue
+
+            # Get current temperatures and humidities (0x6101 - 0x6104)
+            temp_reg, current_humidity, temp2_reg, humidity2 = registers[REG_TEMPERATURE_1:REG_HUMIDITY_2 + 1]
 
             # Update operation status based on power and dehumidify mode
             status = 0
@@ -160,63 +221,63 @@ class MedoleDehumidifierMockServer:
                 # If power is on but dehumidify mode is off, only fan is on
                 status |= STATUS_FAN_ON
 
-            # Update operation status
-            self.context.setValues(3, REG_OPERATION_STATUS, [status])
-
             # If compressor is running, decrease humidity slightly
             if status & STATUS_COMPRESSOR_ON:
                 # Decrease humidity by 0-1% each update
-                new_humidity = max(MIN_HUMIDITY, current_humidity - random.uniform(0, 1))
-                self.context.setValues(3, REG_HUMIDITY_1, [int(new_humidity)])
-
-                # Also update humidity sensor 2
-                humidity2 = self.context.getValues(3, REG_HUMIDITY_2, 1)[0]
-                new_humidity2 = max(MIN_HUMIDITY, humidity2 - random.uniform(0, 1))
-                self.context.setValues(3, REG_HUMIDITY_2, [int(new_humidity2)])
+                new_humidity = max(MIN_HUMIDITY, current_humidity - uniform(0, 1))
+                new_humidity2 = max(MIN_HUMIDITY, humidity2 - uniform(0, 1))
             else:
                 # Increase humidity slightly if not dehumidifying
-                new_humidity = min(MAX_HUMIDITY, current_humidity + random.uniform(0, 0.5))
-                self.context.setValues(3, REG_HUMIDITY_1, [int(new_humidity)])
-
-                # Also update humidity sensor 2
-                humidity2 = self.context.getValues(3, REG_HUMIDITY_2, 1)[0]
-                new_humidity2 = min(MAX_HUMIDITY, humidity2 + random.uniform(0, 0.5))
-                self.context.setValues(3, REG_HUMIDITY_2, [int(new_humidity2)])
-
-            # Randomly vary temperature slightly
-            new_temp = current_temp + random.uniform(-0.2, 0.2)
-            new_temp_int = int(new_temp)
-            new_temp_dec = int((new_temp - new_temp_int) * 10)
-            new_temp_reg = (new_temp_dec << 8) | new_temp_int
-            self.context.setValues(3, REG_TEMPERATURE_1, [new_temp_reg])
-
-            # Also update temperature sensor 2
-            temp2_reg = self.context.getValues(3, REG_TEMPERATURE_2, 1)[0]
-            temp2_int = temp2_reg & 0xFF
-            temp2_dec = (temp2_reg >> 8) & 0xFF
-            current_temp2 = temp2_int + temp2_dec / 10.0
-            new_temp2 = current_temp2 + random.uniform(-0.2, 0.2)
-            new_temp2_int = int(new_temp2)
-            new_temp2_dec = int((new_temp2 - new_temp2_int) * 10)
-            new_temp2_reg = (new_temp2_dec << 8) | new_temp2_int
-            self.context.setValues(3, REG_TEMPERATURE_2, [new_temp2_reg])
-
-            # Update current time
-            now = datetime.now()
-            time_value = (now.minute << 8) | now.hour
-            self.context.setValues(3, REG_CURRENT_TIME, [time_value])
-            self.context.setValues(3, REG_CURRENT_SECONDS, [now.second])
+                new_humidity = min(MAX_HUMIDITY, current_humidity + uniform(0, 0.5))
+                new_humidity2 = min(MAX_HUMIDITY, humidity2 + uniform(0, 0.5))
+
+            # Randomly vary temperatures by up to 0.2°C, in tenths of a degree
+            new_temp_reg = encode_temperature_tenths(
+                decode_temperature_tenths(temp_reg) + randint(-2, 2)
+            )
+            new_temp2_reg = encode_temperature_tenths(
+                decode_temperature_tenths(temp2_reg) + randint(-2, 2)
+            )
+
+            # Write sensors and operation status (0x6101 - 0x6105)
+            registers[REG_TEMPERATURE_1:REG_OPERATION_STATUS + 1] = array("H", (
+                new_temp_reg,
+                int(new_humidity),
+                new_temp2_reg,
+                int(new_humidity2),
+                status,
+            ))
 
             # Increment fan operation hours if fan is on
             if status & STATUS_FAN_ON:
-                fan_hours = self.context.getValues(3, REG_FAN_OPERATION_HOURS, 1)[0]
                 # In real life this would increment every hour, but for testing
-                # we'll increment it slightly each update
-                fan_hours += 0.01  # This will add 1 hour after 100 updates
-                self.context.setValues(3, REG_FAN_OPERATION_HOURS, [int(fan_hours)])
-
-            # Sleep for a while before the next update
-            time.sleep(5)
+                # we'll increment it slightly each update. The fraction is kept
+                # outside the register, which only holds whole hours.
+                self.fan_hundredths += 1  # This will add 1 hour after 100 updates
+                registers[REG_FAN_OPERATION_HOURS] = self.fan_hundredths // 100
+
+            control_changed = await self.wait_for_next_update()
+
+    async def wait_for_next_update(self):
+        """Sleep until the next update, returning True if a control register was written."""
+        loop = asyncio.get_running_loop()
+        # Wake early when a client changes a control register so the status
+        # follows immediately. Scheduled updates stay on a fixed cadence
+        # instead of drifting by the time each update takes.
+        try:
+            await asyncio.wait_for(
+                self.control_written.wait(),
+                max(0, self.next_update - loop.time()),
+            )
+        except asyncio.TimeoutError:
+            self.next_update += UPDATE_INTERVAL
+            # Resynchronize a full interval ahead instead of bursting if
+            # updates fell behind
+            if self.next_update <= loop.time():
+                self.next_update = loop.time() + UPDATE_INTERVAL
+            return False
+        self.control_written.clear()
+        return True
 
     async def start(self):
         """Start the mock Modbus server asynchronously."""
@@ -226,19 +287,18 @@ class MedoleDehumidifierMockServer:
 
         self.running = True
 
-        # Start the sensor update thread
-        self.update_thread = Thread(target=self.update_sensor_values)
-        self.update_thread.daemon = True
-        self.update_thread.start()
+        # Run sensor updates on the server's event loop, so the datastore is
+        # only ever touched from one thread
+        self.update_task = asyncio.create_task(self.update_sensor_values())
 
         # Start the Modbus server
-        _LOGGER.info(f"Starting mock Modbus server on {self.host}:{self.port}")
+        _LOGGER.info("Starting mock Modbus server on %s:%s", self.host, self.port)
         self.server = await StartAsyncTcpServer(
             context=self.server_context,
             address=(self.host, self.port)
         )
 
-        _LOGGER.info(f"Mock Modbus server started on {self.host}:{self.port}")
+        _LOGGER.info("Mock Modbus server started on %s:%s", self.host, self.port)
         _LOGGER.info("Press Ctrl+C to stop the server")
 
     def stop(self):
@@ -248,14 +308,15 @@ class MedoleDehumidifierMockServer:
             return
 
         self.running = False
+        if self.update_task:
+            self.update_task.cancel()
+            self.update_task = None
         if self.server:
             self.server.server_close()
             _LOGGER.info("Mock Modbus server stopped")
 
 
 if __name__ == "__main__":
-    import asyncio
-
     # Create the mock server
     server = MedoleDehumidifierMockServer()
 
@@ -271,7 +332,7 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             _LOGGER.info("Server stopped by user")
         except Exception as e:
-            _LOGGER.error(f"Error: {e}")
+            _LOGGER.error("Error: %s", e)
         finally:
             server.stop()
 
@@ -4,6 +4,7 @@ Test script for the Medole Dehumidifier Mock Modbus Server.
 This script connects to the mock server and tests various functions.
 """
 import logging
+import socket
 import time
 
 # Import register definitions from common module
@@ -30,6 +31,7 @@ from medole_registers import (
     REG_TEMPERATURE_1,
     REG_TEMPERATURE_2,
     REG_TIMER_FUNCTION,
+    STATUS_COMPRESSOR_ON,
     decode_operation_status,
     # Helper functions
     decode_temperature,
@@ -47,177 +49,155 @@ _LOGGER = logging.getLogger(__name__)
 
 # Note: decode_operation_status and decode_time are imported from medole_registers
 
+WEEKDAY_NAMES = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+FAN_SPEED_NAMES = {FAN_SPEED_LOW: "Low", FAN_SPEED_MEDIUM: "Medium", FAN_SPEED_HIGH: "High"}
 
-def test_mock_server(host="localhost", port=5020, slave_id=1):
-    """Test the mock Modbus server."""
-    client = ModbusTcpClient(host=host, port=port)
 
-    try:
-        # Connect to the server
-        if not client.connect():
-            _LOGGER.error("Failed to connect to the server")
-            return False
+def format_temperature(value):
+    """Format a temperature register."""
+    return f"{decode_temperature(value):.1f}°C"
 
-        _LOGGER.info("Connected to the server")
 
-        # Read sensor data
-        _LOGGER.info("Reading sensor data...")
+def format_percentage(value):
+    """Format a humidity register."""
+    return f"{value}%"
 
-        # Temperature 1
-        result = client.read_holding_registers(REG_TEMPERATURE_1, count=1, slave=slave_id)
-        if not result.isError():
-            temp = decode_temperature(result.registers[0])
-            _LOGGER.info(f"Temperature 1: {temp:.1f}°C")
 
-        # Humidity 1
-        result = client.read_holding_registers(REG_HUMIDITY_1, count=1, slave=slave_id)
-        if not result.isError():
-            humidity = result.registers[0]
-            _LOGGER.info(f"Humidity 1: {humidity}%")
+def format_on_off(value):
+    """Format an on/off register."""
+    return "On" if value == 1 else "Off"
 
-        # Temperature 2
-        result = client.read_holding_registers(REG_TEMPERATURE_2, count=1, slave=slave_id)
-        if not result.isError():
-            temp = decode_temperature(result.registers[0])
-            _LOGGER.info(f"Temperature 2: {temp:.1f}°C")
 
-        # Humidity 2
-        result = client.read_holding_registers(REG_HUMIDITY_2, count=1, slave=slave_id)
-        if not result.isError():
-            humidity = result.registers[0]
-            _LOGGER.info(f"Humidity 2: {humidity}%")
+def format_fan_speed(value):
+    """Format the fan speed register."""
+    return f"{FAN_SPEED_NAMES.get(value, 'Unknown')} ({value})"
 
-        # Operation status
-        result = client.read_holding_registers(REG_OPERATION_STATUS, count=1, slave=slave_id)
-        if not result.isError():
-            status = decode_operation_status(result.registers[0])
-            _LOGGER.info(f"Operation status: {status}")
 
-        # Pipe temperature
-        result = client.read_holding_registers(REG_PIPE_TEMPERATURE, count=1, slave=slave_id)
-        if not result.isError():
-            temp = decode_temperature(result.registers[0])
-            _LOGGER.info(f"Pipe temperature: {temp:.1f}°C")
+def format_setpoint(value):
+    """Format the humidity setpoint register."""
+    return "Continuous" if value == 0 else f"{value}%"
 
-        # Fan operation hours
-        result = client.read_holding_registers(REG_FAN_OPERATION_HOURS, count=1, slave=slave_id)
-        if not result.isError():
-            hours = result.registers[0]
-            _LOGGER.info(f"Fan operation hours: {hours}")
 
-        # Fan alarm hours
-        result = client.read_holding_registers(REG_FAN_ALARM_HOURS, count=1, slave=slave_id)
-        if not result.isError():
-            hours = result.registers[0]
-            _LOGGER.info(f"Fan alarm hours: {hours}")
+def format_weekday(value):
+    """Format the weekday register (1=Sunday, ..., 7=Saturday)."""
+    return f"{WEEKDAY_NAMES[value - 1]} ({value})"
 
-        # Read control registers
-        _LOGGER.info("\nReading control registers...")
 
-        # Power
-        result = client.read_holding_registers(REG_POWER, count=1, slave=slave_id)
-        if not result.isError():
-            power = "On" if result.registers[0] == 1 else "Off"
-            _LOGGER.info(f"Power: {power}")
+# Register blocks read by the test as (heading, first, last, fields), where
+# each field is (register, label, formatter)
+READ_BLOCKS = (
+    ("Reading sensor data...", REG_TEMPERATURE_1, REG_PIPE_TEMPERATURE, (
+        (REG_TEMPERATURE_1, "Temperature 1", format_temperature),
+        (REG_HUMIDITY_1, "Humidity 1", format_percentage),
+        (REG_TEMPERATURE_2, "Temperature 2", format_temperature),
+        (REG_HUMIDITY_2, "Humidity 2", format_percentage),
+        (REG_OPERATION_STATUS, "Operation status", decode_operation_status),
+        (REG_PIPE_TEMPERATURE, "Pipe temperature", format_temperature),
+    )),
+    (None, REG_FAN_OPERATION_HOURS, REG_FAN_ALARM_HOURS, (
+        (REG_FAN_OPERATION_HOURS, "Fan operation hours", str),
+        (REG_FAN_ALARM_HOURS, "Fan alarm hours", str),
+    )),
+    ("\nReading control registers...", REG_POWER, REG_PURIFY_MODE, (
+        (REG_POWER, "Power", format_on_off),
+        (REG_FAN_SPEED, "Fan speed", format_fan_speed),
+        (REG_HUMIDITY_SETPOINT, "Humidity setpoint", format_setpoint),
+        (REG_DEHUMIDIFY_MODE, "Dehumidify mode", format_on_off),
+        (REG_PURIFY_MODE, "Purify mode", format_on_off),
+    )),
+    ("\nReading time function registers...", REG_CURRENT_TIME, REG_TIMER_FUNCTION, (
+        (REG_CURRENT_TIME, "Current time", decode_time),
+        (REG_CURRENT_SECONDS, "Current seconds", str),
+        (REG_CURRENT_WEEKDAY, "Current weekday", format_weekday),
+        (REG_TIMER_FUNCTION, "Timer function", str),
+    )),
+)
 
-        # Fan speed
-        result = client.read_holding_registers(REG_FAN_SPEED, count=1, slave=slave_id)
-        if not result.isError():
-            speed = result.registers[0]
-            speed_text = "Low" if speed == FAN_SPEED_LOW else "Medium" if speed == FAN_SPEED_MEDIUM else "High" if speed == FAN_SPEED_HIGH else "Unknown"
-            _LOGGER.info(f"Fan speed: {speed_text} ({speed})")
 
-        # Humidity setpoint
-        result = client.read_holding_registers(REG_HUMIDITY_SETPOINT, count=1, slave=slave_id)
-        if not result.isError():
-            setpoint = result.registers[0]
-            setpoint_text = "Continuous" if setpoint == 0 else f"{setpoint}%"
-            _LOGGER.info(f"Humidity setpoint: {setpoint_text}")
+def read_registers(client, first, last, slave_id):
+    """Read registers first..last in one request, mapped by address."""
+    result = client.read_holding_registers(first, count=last - first + 1, slave=slave_id)
+    if result.isError():
+        _LOGGER.error("Error reading registers %#06x-%#06x: %s", first, last, result)
+        return None
+    return dict(zip(range(first, last + 1), result.registers, strict=True))
 
-        # Dehumidify mode
-        result = client.read_holding_registers(REG_DEHUMIDIFY_MODE, count=1, slave=slave_id)
-        if not result.isError():
-            mode = "On" if result.registers[0] == 1 else "Off"
-            _LOGGER.info(f"Dehumidify mode: {mode}")
 
-        # Purify mode
-        result = client.read_holding_registers(REG_PURIFY_MODE, count=1, slave=slave_id)
-        if not result.isError():
-            mode = "On" if result.registers[0] == 1 else "Off"
-            _LOGGER.info(f"Purify mode: {mode}")
+def wait_for_status(client, mask, slave_id, timeout=2.0):
+    """Poll the operation status until a bit in mask is set, up to timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = client.read_holding_registers(REG_OPERATION_STATUS, count=1, slave=slave_id)
+        if not result.isError() and result.registers[0] & mask:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
 
-        # Read time function registers
-        _LOGGER.info("\nReading time function registers...")
 
-        # Current time
-        result = client.read_holding_registers(REG_CURRENT_TIME, count=1, slave=slave_id)
-        if not result.isError():
-            time_str = decode_time(result.registers[0])
-            _LOGGER.info(f"Current time: {time_str}")
+def test_mock_server(host="localhost", port=5020, slave_id=1):
+    """Test the mock Modbus server."""
+    client = ModbusTcpClient(host=host, port=port)
 
-        # Current seconds
-        result = client.read_holding_registers(REG_CURRENT_SECONDS, count=1, slave=slave_id)
-        if not result.isError():
-            seconds = result.registers[0]
-            _LOGGER.info(f"Current seconds: {seconds}")
+    try:
+        # Connect to the server
+        if not client.connect():
+            _LOGGER.error("Failed to connect to the server")
+            return False
 
-        # Current weekday
-        result = client.read_holding_registers(REG_CURRENT_WEEKDAY, count=1, slave=slave_id)
-        if not result.isError():
-            weekday = result.registers[0]
-            weekday_text = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"][weekday - 1]
-            _LOGGER.info(f"Current weekday: {weekday_text} ({weekday})")
+        _LOGGER.info("Connected to the server")
 
-        # Timer function
-        result = client.read_holding_registers(REG_TIMER_FUNCTION, count=1, slave=slave_id)
-        if not result.isError():
-            timer = result.registers[0]
-            _LOGGER.info(f"Timer function: {timer}")
+        # Send each small request immediately instead of waiting on Nagle
+        client.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Read each contiguous register block in one request
+        for heading, first, last, fields in READ_BLOCKS:
+            if heading:
+                _LOGGER.info(heading)
+
+            registers = read_registers(client, first, last, slave_id)
+            if registers:
+                for register, label, formatter in fields:
+                    _LOGGER.info("%s: %s", label, formatter(registers[register]))
 
         # Test writing to registers
         _LOGGER.info("\nTesting write operations...")
 
         # Turn on power
-        _LOGGER.info("Turning on power...")
-        result = client.write_register(address=REG_POWER, value=1, slave=slave_id)
-        if not result.isError():
-            _LOGGER.info("Power turned on")
-
-        # Set fan speed to medium
-        _LOGGER.info("Setting fan speed to medium...")
-        result = client.write_register(address=REG_FAN_SPEED, value=FAN_SPEED_MEDIUM, slave=slave_id)
-        if not result.isError():
-            _LOGGER.info("Fan speed set to medium")
-
-        # Set humidity setpoint to 45%
-        _LOGGER.info("Setting humidity setpoint to 45%...")
-        result = client.write_register(address=REG_HUMIDITY_SETPOINT, value=45, slave=slave_id)
+        _LOGGER.info("Turning on power, setting fan speed to medium and humidity setpoint to 45%...")
+        # Power, fan speed and humidity setpoint (0x6201 - 0x6203) in one request
+        result = client.write_registers(
+            address=REG_POWER,
+            values=[1, FAN_SPEED_MEDIUM, 45],
+            slave=slave_id,
+        )
         if not result.isError():
-            _LOGGER.info("Humidity setpoint set to 45%")
+            _LOGGER.info("Power turned on, fan speed set to medium, humidity setpoint set to 45%")
 
-        # Turn on dehumidify mode
+        # Turn on dehumidify mode (0x6205 is not contiguous with 0x6203)
         _LOGGER.info("Turning on dehumidify mode...")
         result = client.write_register(address=REG_DEHUMIDIFY_MODE, value=1, slave=slave_id)
         if not result.isError():
             _LOGGER.info("Dehumidify mode turned on")
 
-        # Wait a bit for the server to update
-        _LOGGER.info("\nWaiting for 10 seconds to see changes...")
-        time.sleep(10)
+        # Wait for the server to start the compressor
+        _LOGGER.info("\nWaiting for the compressor to start...")
+        if not wait_for_status(client, STATUS_COMPRESSOR_ON, slave_id):
+            _LOGGER.warning("Compressor did not start within 2 seconds")
 
         # Read operation status again to see changes
         _LOGGER.info("\nReading operation status after changes...")
         result = client.read_holding_registers(REG_OPERATION_STATUS, count=1, slave=slave_id)
         if not result.isError():
             status = decode_operation_status(result.registers[0])
-            _LOGGER.info(f"Operation status: {status}")
+            _LOGGER.info("Operation status: %s", status)
 
         # Read humidity again to see if it's changing
         _LOGGER.info("\nReading humidity after changes...")
         result = client.read_holding_registers(REG_HUMIDITY_1, count=1, slave=slave_id)
         if not result.isError():
             humidity = result.registers[0]
-            _LOGGER.info(f"Humidity 1: {humidity}%")
+            _LOGGER.info("Humidity 1: %s%%", humidity)
 
         # Turn everything off
         _LOGGER.info("\nTurning everything off...")
@@ -228,7 +208,7 @@ def test_mock_server(host="localhost", port=5020, slave_id=1):
         return True
 
     except Exception as e:
-        _LOGGER.error(f"Error: {e}")
+        _LOGGER.error("Error: %s", e)
         return False
 
     finally:
@@ -0,0 +1,70 @@
+"""Tests for the shared Medole Modbus client."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.medole.const import (
+    CONF_CONNECTION_TYPE,
+    CONF_HOST,
+    CONF_TCP_PORT,
+    CONNECTION_TYPE_TCP,
+)
+from custom_components.medole.modbus import MedoleModbusClient
+
+CONFIG = {
+    CONF_CONNECTION_TYPE: CONNECTION_TYPE_TCP,
+    CONF_HOST: "192.0.2.1",
+    CONF_TCP_PORT: 502,
+}
+
+
+@pytest.fixture(autouse=True)
+def modbus_clients():
+    """Give each test fresh registries and a fake pymodbus client per bus."""
+    with (
+        patch.dict(MedoleModbusClient._instances, clear=True),
+        patch.dict(MedoleModbusClient._transports, clear=True),
+        patch.object(
+            MedoleModbusClient,
+            "_create_modbus_client",
+            side_effect=lambda: MagicMock(),
+        ),
+    ):
+        yield
+
+
+def test_entries_sharing_a_device_keep_the_connection_open():
+    """Closing one of two entries on the same device keeps it connected."""
+    first = MedoleModbusClient.get_or_create(None, CONFIG, 1)
+    second = MedoleModbusClient.get_or_create(None, CONFIG, 1)
+    assert first is second
+    modbus_client = first.client
+
+    asyncio.run(first.async_close())
+    modbus_client.close.assert_not_called()
+    assert MedoleModbusClient.get_or_create(None, CONFIG, 1) is first
+
+    asyncio.run(first.async_close())
+    modbus_client.close.assert_not_called()
+
+    asyncio.run(second.async_close())
+    modbus_client.close.assert_called_once()
+    assert not MedoleModbusClient._instances
+    assert not MedoleModbusClient._transports
+
+
+def test_devices_on_one_bus_share_the_connection():
+    """The bus connection is closed once its last device is closed."""
+    first = MedoleModbusClient.get_or_create(None, CONFIG, 1)
+    second = MedoleModbusClient.get_or_create(None, CONFIG, 2)
+    assert first is not second
+    assert first.client is second.client
+
+    asyncio.run(first.async_close())
+    first.client.close.assert_not_called()
+
+    asyncio.run(second.async_close())
+    first.client.close.assert_called_once()
+    assert not MedoleModbusClient._transports